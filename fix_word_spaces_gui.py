@@ -1,6 +1,7 @@
 """
 fix_word_spaces_gui.py  —  Fixes Word Online phantom spaces in .docx / .odt
-Pure Python stdlib, no pip installs needed.
+Pure Python stdlib, no pip installs needed (uses lxml when available — faster
+on large documents).
 
 ROOT CAUSE
 ----------
@@ -10,8 +11,14 @@ entirely, injecting a single space into the surrounding text/tail, then
 collapses any remaining literal multi-space runs.
 """
 
-import re, os, zipfile, shutil, tempfile
-import xml.etree.ElementTree as ET
+import re, os, copy, zipfile, shutil, tempfile, threading
+from itertools import zip_longest
+try:
+    from lxml import etree as ET        # C parser/serializer, ~2x faster on big XML
+    HAVE_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    HAVE_LXML = False
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 
@@ -58,50 +65,116 @@ ODT_NS = {
     "xml":"http://www.w3.org/XML/1998/namespace",
 }
 for _p, _u in {**DOCX_NS, **ODT_NS}.items():
+    if HAVE_LXML and _p == "xml": continue   # lxml refuses to rebind "xml"
     ET.register_namespace(_p, _u)
 
+# lxml keeps comments/PIs as nodes (stdlib drops them); strip them so both
+# backends see the same text and report the same stats.
+_PARSER = ET.XMLParser(remove_comments=True, remove_pis=True) if HAVE_LXML else None
+
 EXTRA_SPACE = re.compile(r"[ \u00a0]{2,}")
+_extra_space_subn = EXTRA_SPACE.subn
+
+def _collapse_runs(s):
+    """Same result as EXTRA_SPACE.subn(" ", s), but only strings with an actual
+    nbsp-containing run go through the regex (lone nbsps, e.g. French
+    punctuation, are common).  Space-only runs of 2-3 (typing slips) are
+    collapsed with C-level str methods; longer phantom runs go back to the
+    regex, which stays linear where repeated halving does not.  "\\0" can
+    never occur in XML text, so it is a safe marker."""
+    if "\u00a0" in s:
+        if "\u00a0\u00a0" in s or " \u00a0" in s or "\u00a0 " in s or "  " in s:
+            return _extra_space_subn(" ", s)
+        return s, 0
+    if "  " not in s: return s, 0
+    if "    " in s: return _extra_space_subn(" ", s)   # some run is 4+ long
+    t = s.replace("  ", "\0")         # each 2-3 space run -> one marker (+ " ")
+    return t.replace("\0 ", " ").replace("\0", " "), t.count("\0")
+
+# Byte-level pre-scan: every pair EXTRA_SPACE could match, as UTF-8.
+_RUN_PAIRS = (b"  ", b"\xc2\xa0\xc2\xa0", b" \xc2\xa0", b"\xc2\xa0 ")
+
+def _may_need_fix(xml_bytes):
+    """False only when no space/nbsp run can possibly exist — lets clean files
+    skip the fix pass and re-serialisation entirely."""
+    if xml_bytes[:2] in (b"\xff\xfe", b"\xfe\xff"): return True  # UTF-16
+    if b"&#" in xml_bytes: return True   # char refs may hide spaces/nbsp
+    return any(pair in xml_bytes for pair in _RUN_PAIRS)
+
+# The rewritten XML deflates well even at level 1, ~3-4x faster than the default 6
+XML_DEFLATE_LEVEL = 1
+
+# Already-compressed media: deflating it again burns CPU for ~0% size gain.
+_PRECOMPRESSED = (".png", ".jpg", ".jpeg", ".gif", ".webp", ".emz", ".wmz",
+                  ".wdp", ".jxr", ".woff", ".woff2", ".mp3", ".mp4", ".m4a", ".zip")
+
+def _out_info(item):
+    """ZipInfo for copying an untouched member: media is written ZIP_STORED,
+    everything else keeps its original compression.  Always a copy —
+    zout.open(..., "w") resets the CRC, sizes and flags of the info it gets,
+    and item belongs to zin."""
+    info = copy.copy(item)
+    if item.filename.lower().endswith(_PRECOMPRESSED):
+        info.compress_type = zipfile.ZIP_STORED
+    return info
 
 # ── DOCX ──────────────────────────────────────────────────────────────────────
 W_T = f"{{{DOCX_W}}}t"
 W_P = f"{{{DOCX_W}}}p"
 
 def _fix_docx_xml(xml_bytes):
-    root = ET.fromstring(xml_bytes)
+    """Returns (new_bytes, groups, chars, before_text, after_text) from one parse."""
+    root = ET.fromstring(xml_bytes, _PARSER)
+    before = _plain_docx(root)
+    if not _may_need_fix(xml_bytes):
+        return xml_bytes, 0, 0, before, before
     groups = chars = 0
+    runs = _collapse_runs                     # locals: LOAD_FAST in the hot loop
+    xml_space = "{http://www.w3.org/XML/1998/namespace}space"
     for wt in root.iter(W_T):
-        for attr in ("text", "tail"):
-            val = getattr(wt, attr)
-            if not val: continue
-            fixed, n = EXTRA_SPACE.subn(" ", val)
+        val = wt.text
+        if val:
+            fixed, n = runs(val)
+            if n:
+                groups += n; chars += len(val) - len(fixed)
+                wt.text = fixed
+                if fixed != fixed.strip():
+                    wt.set(xml_space, "preserve")
+        val = wt.tail
+        if val:
+            fixed, n = runs(val)
             if n:
                 groups += n; chars += len(val) - len(fixed)
-                setattr(wt, attr, fixed)
-                if attr == "text" and fixed != fixed.strip():
-                    wt.set("{http://www.w3.org/XML/1998/namespace}space", "preserve")
-    return ET.tostring(root, encoding="unicode").encode("utf-8"), groups, chars
+                wt.tail = fixed
+    after = _plain_docx(root)
+    return (ET.tostring(root, encoding="utf-8", xml_declaration=True),
+            groups, chars, before, after)
 
-def _plain_docx(xml_bytes):
-    root = ET.fromstring(xml_bytes)
+def _plain_docx(root):
     lines = []
     for para in root.iter(W_P):
         lines.append("".join(wt.text for wt in para.iter(W_T) if wt.text))
     return "\n".join(lines)
 
 def fix_docx(inp, out):
-    tmp_fd, tmp = tempfile.mkstemp(suffix=".docx"); os.close(tmp_fd)
+    # Temp file beside the output so os.replace is an atomic rename, never a copy
+    # (".~<name>." prefix so a leftover from a crash is recognisable there)
+    tmp_fd, tmp = tempfile.mkstemp(suffix=".docx", prefix=f".~{os.path.basename(out)}.",
+                                   dir=os.path.dirname(os.path.abspath(out)))
+    os.close(tmp_fd)
     try:
         tg = tc = 0; before = after = ""
         with zipfile.ZipFile(inp, "r") as zin:
-            before = _plain_docx(zin.read("word/document.xml"))
             with zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_DEFLATED) as zout:
                 for item in zin.infolist():
-                    data = zin.read(item.filename)
                     if item.filename == "word/document.xml":
-                        data, g, c = _fix_docx_xml(data); tg += g; tc += c
-                        after = _plain_docx(data)
-                    zout.writestr(item, data)
-        shutil.move(tmp, out)
+                        data, g, c, before, after = _fix_docx_xml(zin.read(item)); tg += g; tc += c
+                        zout.writestr(copy.copy(item), data, compress_type=zipfile.ZIP_DEFLATED,
+                                      compresslevel=XML_DEFLATE_LEVEL)
+                    else:  # stream untouched members — never hold a whole image in RAM
+                        with zin.open(item) as src, zout.open(_out_info(item), "w") as dst:
+                            shutil.copyfileobj(src, dst, 1 << 20)
+        os.replace(tmp, out)
         return {"groups": tg, "chars": tc, "before": before, "after": after}
     except Exception:
         if os.path.exists(tmp): os.unlink(tmp)
@@ -115,83 +188,112 @@ def fix_docx(inp, out):
 T_S      = f"{{{ODT_TEXT}}}s"
 T_P      = f"{{{ODT_TEXT}}}p"
 T_C_ATTR = f"{{{ODT_TEXT}}}c"
+_ODT_S_OPEN = re.compile(rb"<(?:[\w.-]+:)?s\s")  # <text:s …> with attributes
+SPACER      = "\x01"          # stands in for a removed <text:s>; invalid in XML
+_marked_run_subn = re.compile(r"[ \u00a0\x01]{2,}").subn
+
+class _ODTFixState:
+    """Running totals for one _fix_odt_xml call."""
+    __slots__ = ("groups", "chars")
+    def __init__(self): self.groups = self.chars = 0
+
+def _odt_collapse(state, s):
+    """Collapse 2+ spaces/nbsp to single space, tracking stats in state.  A
+    SPACER (left by a removed <text:s>) counts as one space."""
+    if not s: return s
+    if SPACER in s:
+        fixed, n = _marked_run_subn(" ", s)
+        fixed = fixed.replace(SPACER, " ")             # lone spacer -> space
+    else:
+        fixed, n = _collapse_runs(s)
+    if n: state.groups += n; state.chars += len(s) - len(fixed)
+    return fixed
 
 def _fix_odt_xml(xml_bytes):
-    root = ET.fromstring(xml_bytes)
-    groups = [0]; chars = [0]
-
-    def collapse(s):
-        """Collapse 2+ spaces/nbsp to single space, tracking stats."""
-        if not s: return s
-        fixed, n = EXTRA_SPACE.subn(" ", s)
-        if n: groups[0] += n; chars[0] += len(s) - len(fixed)
-        return fixed
-
-    def fix_element(parent):
-        parent.text = collapse(parent.text)
-
-        to_remove = []  # indices of text:s children with c > 1
-        for i, child in enumerate(parent):
-            fix_element(child)  # recurse first
-            if child.tag == T_S:
-                raw_c = child.get(T_C_ATTR)
+    """Returns (new_bytes, groups, chars, before_text, after_text) from one parse."""
+    root = ET.fromstring(xml_bytes, _PARSER)
+    before = _plain_odt(root)
+    if not _may_need_fix(xml_bytes) and not _ODT_S_OPEN.search(xml_bytes):
+        return xml_bytes, 0, 0, before, before
+    st = _ODTFixState()
+    collapse, t_s, t_c = _odt_collapse, T_S, T_C_ATTR   # locals for the hot loop
+
+    # Flat pre-order walk (no recursion).  Each parent's child list is rebuilt
+    # once instead of parent.remove() per <text:s>, which shifts the list
+    # every time and goes quadratic on heavily-spaced paragraphs.  Removed
+    # elements only leave a SPACER behind (in local strings — lxml rejects
+    # control chars on elements); every text/tail is then collapsed exactly
+    # once, after all merges into it are done.
+    for parent in list(root.iter()):
+        text = parent.text
+        kept = []; tails = []
+        for child in parent:
+            if child.tag == t_s:
+                raw_c = child.get(t_c)
                 count = int(raw_c) if raw_c is not None else 1
                 if count > 1:
-                    # Will be removed; record index and its tail
-                    groups[0] += 1; chars[0] += count - 1
-                    to_remove.append((i, child.tail or ""))
-                else:
-                    child.tail = collapse(child.tail)
-            else:
-                child.tail = collapse(child.tail)
-
-        # Remove in reverse order so indices stay valid
-        for i, tail in reversed(to_remove):
-            # Merge: inject one space + collapsed tail into prev sibling's tail
-            # or into parent.text if this was the first child
-            space_plus_tail = collapse(" " + tail)
-            if i == 0:
-                parent.text = collapse((parent.text or "") + space_plus_tail)
-            else:
-                prev = parent[i - 1]
-                prev.tail = collapse((prev.tail or "") + space_plus_tail)
-            parent.remove(parent[i])
-
-    fix_element(root)
-    return ET.tostring(root, encoding="unicode").encode("utf-8"), groups[0], chars[0]
-
-def _plain_odt(xml_bytes):
-    root = ET.fromstring(xml_bytes)
+                    # Drop it: SPACER + its tail go onto the previous kept
+                    # sibling's tail, or onto parent.text if there is none
+                    st.groups += 1; st.chars += count - 1
+                    spacer_tail = SPACER + (child.tail or "")
+                    if kept: tails[-1] = (tails[-1] or "") + spacer_tail
+                    else:    text = (text or "") + spacer_tail
+                    continue
+            kept.append(child); tails.append(child.tail)
+        parent.text = collapse(st, text)
+        for child, tail in zip(kept, tails): child.tail = collapse(st, tail)
+        if len(kept) != len(parent):
+            parent[:] = kept
+
+    after = _plain_odt(root)
+    return (ET.tostring(root, encoding="utf-8", xml_declaration=True),
+            st.groups, st.chars, before, after)
+
+def _plain_odt(root):
     lines = []
+    t_s, t_c = T_S, T_C_ATTR
     for para in root.iter(T_P):
-        parts = []
-        def _collect(el):
-            if el.tag == T_S:
-                parts.append(" " * int(el.get(T_C_ATTR, "1")))
+        parts = [para.text] if para.text else []
+        # Iterator stack instead of a recursive closure: no Python frame per
+        # element and no recursion limit on deeply nested spans/tables.  Each
+        # entry carries the tail to emit once that element's children are done.
+        stack = [(iter(para), None)]
+        while stack:
+            it, tail = stack[-1]
+            for el in it:
+                if el.tag == t_s:
+                    parts.append(" " * int(el.get(t_c, "1")))
+                    if el.tail: parts.append(el.tail)
+                    continue
+                if el.text: parts.append(el.text)
+                if len(el):
+                    stack.append((iter(el), el.tail)); break
                 if el.tail: parts.append(el.tail)
-                return
-            if el.text: parts.append(el.text)
-            for ch in el: _collect(ch)
-            if el.tail: parts.append(el.tail)
-        if para.text: parts.append(para.text)
-        for ch in para: _collect(ch)
+            else:
+                stack.pop()
+                if tail: parts.append(tail)
         lines.append("".join(parts))
     return "\n".join(lines)
 
 def fix_odt(inp, out):
-    tmp_fd, tmp = tempfile.mkstemp(suffix=".odt"); os.close(tmp_fd)
+    # Temp file beside the output so os.replace is an atomic rename, never a copy
+    # (".~<name>." prefix so a leftover from a crash is recognisable there)
+    tmp_fd, tmp = tempfile.mkstemp(suffix=".odt", prefix=f".~{os.path.basename(out)}.",
+                                   dir=os.path.dirname(os.path.abspath(out)))
+    os.close(tmp_fd)
     try:
         tg = tc = 0; before = after = ""
         with zipfile.ZipFile(inp, "r") as zin:
-            before = _plain_odt(zin.read("content.xml"))
             with zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_DEFLATED) as zout:
                 for item in zin.infolist():
-                    data = zin.read(item.filename)
                     if item.filename == "content.xml":
-                        data, g, c = _fix_odt_xml(data); tg += g; tc += c
-                        after = _plain_odt(data)
-                    zout.writestr(item, data)
-        shutil.move(tmp, out)
+                        data, g, c, before, after = _fix_odt_xml(zin.read(item)); tg += g; tc += c
+                        zout.writestr(copy.copy(item), data, compress_type=zipfile.ZIP_DEFLATED,
+                                      compresslevel=XML_DEFLATE_LEVEL)
+                    else:  # stream untouched members — never hold a whole image in RAM
+                        with zin.open(item) as src, zout.open(_out_info(item), "w") as dst:
+                            shutil.copyfileobj(src, dst, 1 << 20)
+        os.replace(tmp, out)
         return {"groups": tg, "chars": tc, "before": before, "after": after}
     except Exception:
         if os.path.exists(tmp): os.unlink(tmp)
@@ -203,6 +305,16 @@ def fix_file(inp, out):
     if ext == ".odt":  return fix_odt(inp, out)
     raise ValueError(f"Unsupported type: {ext}  (use .docx or .odt)")
 
+def _iter_lines(s):
+    r"""Lazy s.split("\n") without a trailing empty line — the preview text is
+    "\n"-joined, so this walks it without building a list of every line."""
+    start, n = 0, len(s)
+    while start < n:
+        end = s.find("\n", start)
+        if end < 0: end = n
+        yield s[start:end]
+        start = end + 1
+
 # ── Self-test ─────────────────────────────────────────────────────────────────
 def _selftest():
     cases = [
@@ -210,13 +322,38 @@ def _selftest():
         ("literal spaces", b'<r xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0"><text:p>cheers                    erupting</text:p></r>', "cheers erupting"),
         ("nbsp x5",        '<r xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0"><text:p>cheers\u00a0\u00a0\u00a0\u00a0\u00a0erupting</text:p></r>'.encode("utf-8"), "cheers erupting"),
         ("mix s+tail",     b'<r xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0"><text:p>cheers<text:s text:c="5"/>   erupting</text:p></r>', "cheers erupting"),
+        ("adjacent s",     b'<r xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0"><text:p>cheers<text:s text:c="3"/><text:s text:c="2"/>erupting</text:p></r>', "cheers erupting"),
+        ("comment + pi",   b'<r xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0"><text:p>cheers<!-- a  b --><text:s text:c="44"/>erupting<?pi  x?></text:p></r>', "cheers erupting"),
         ("span tail",      b'<r xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0"><text:p><text:span>cheers</text:span>                    erupting</text:p></r>', "cheers erupting"),
     ]
     for name, xml, expected in cases:
-        out_bytes, g, c = _fix_odt_xml(xml)
-        text = "".join(ET.fromstring(out_bytes.decode()).itertext())
+        out_bytes, g, c, _, after = _fix_odt_xml(xml)
+        text = "".join(ET.fromstring(out_bytes).itertext())
         assert expected in text, f"FAIL [{name}]: got {text!r}"
-    print(f"Self-test PASSED: all {len(cases)} cases produce single space")
+        assert expected in after, f"FAIL [{name}] plain text: got {after!r}"
+
+    # _collapse_runs must match EXTRA_SPACE.subn exactly: (text, groups)
+    runs = [
+        ("a  b",                  ("a b", 1)),            # even run
+        ("a   b",                 ("a b", 1)),            # odd run
+        ("  a    b     c ",       (" a b c ", 3)),        # edges, even + odd
+        ("a" + " " * 44 + "b",    ("a b", 1)),
+        ("a \u00a0 b\u00a0\u00a0c", ("a b c", 2)),       # mixed space/nbsp
+        ("a\u00a0b c",            ("a\u00a0b c", 0)),      # lone nbsp stays
+        ("a b",                   ("a b", 0)),
+    ]
+    for s, expected in runs:
+        got = _collapse_runs(s)
+        assert got == expected == EXTRA_SPACE.subn(" ", s), f"FAIL [runs {s!r}]: got {got!r}"
+
+    docx = ('<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+            '<w:body><w:p><w:r><w:t>cheers    erupting  </w:t></w:r>'
+            '<w:r><w:t>and\u00a0\u00a0 more</w:t></w:r></w:p></w:body></w:document>').encode("utf-8")
+    out_bytes, g, c, _, after = _fix_docx_xml(docx)
+    assert (g, c, after) == (3, 6, "cheers erupting and more"), \
+        f"FAIL [docx]: got {(g, c, after)!r}"
+    assert b'xml:space="preserve"' in out_bytes, "FAIL [docx]: trailing space not preserved"
+    print(f"Self-test PASSED: all {len(cases) + len(runs) + 1} cases (ODT, run collapsing, DOCX)")
 
 # ── GUI ───────────────────────────────────────────────────────────────────────
 BG="#0f0f0f"; PANEL="#161616"; BORDER="#242424"
@@ -234,7 +371,10 @@ class App(tk.Tk):
         self._inp    = tk.StringVar()
         self._out    = tk.StringVar()
         self._status = tk.StringVar(value="Open a .docx or .odt file to get started.")
+        self._loads  = {}    # Text widget path -> token of its in-progress _write
+        self._worker = None; self._closing = False
         self._build()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
         w, h = 980, 720
         x = (self.winfo_screenwidth()  - w) // 2
         y = (self.winfo_screenheight() - h) // 2
@@ -260,7 +400,8 @@ class App(tk.Tk):
         self._file_row(fp, "OUTPUT (.docx / .odt)", self._out, self._browse_out, 1)
 
         bf = tk.Frame(self, bg=BG, pady=4); bf.pack(fill="x", padx=20, pady=(0,10))
-        self._btn(bf, "⚡  FIX & SAVE", self._do_fix, accent=True).pack(side="left")
+        self._fix_btn = self._btn(bf, "⚡  FIX & SAVE", self._do_fix, accent=True)
+        self._fix_btn.pack(side="left")
 
         style = ttk.Style(); style.theme_use("default")
         style.configure("D.TNotebook", background=BG, borderwidth=0)
@@ -268,6 +409,11 @@ class App(tk.Tk):
                         font=("Courier New", 9, "bold"), padding=[12, 5])
         style.map("D.TNotebook.Tab",
                   background=[("selected", PANEL)], foreground=[("selected", ACCENT)])
+        style.configure("D.Horizontal.TProgressbar", background=ACCENT,
+                        troughcolor=PANEL, borderwidth=0)
+        # Packed next to the button only while a fix is running
+        self._progress = ttk.Progressbar(bf, mode="indeterminate", length=180,
+                                         style="D.Horizontal.TProgressbar")
         nb = ttk.Notebook(self, style="D.TNotebook")
         nb.pack(fill="both", expand=True, padx=20, pady=(0,4))
         self._before_box = self._tab(nb, "BEFORE")
@@ -309,9 +455,22 @@ class App(tk.Tk):
         b.bind("<Leave>", lambda e: b.config(bg=bg))
         return b
 
-    def _write(self, box, text):
-        box.config(state="normal"); box.delete("1.0", "end")
-        box.insert("1.0", text);   box.config(state="disabled")
+    def _write(self, box, text, chunk=1 << 16):
+        # Load in 64 KB pieces, one per event-loop turn, with wrapping off
+        # until done, so a multi-MB preview doesn't freeze the window.  A
+        # newer _write to the same box abandons a load still in progress.
+        token = self._loads[str(box)] = object()
+        box.config(state="normal", wrap="none"); box.delete("1.0", "end")
+        box.config(state="disabled")
+
+        def step(i):
+            if self._loads.get(str(box)) is not token: return
+            box.config(state="normal"); box.insert("end", text[i:i + chunk])
+            if i + chunk < len(text):
+                box.config(state="disabled"); self.after(1, step, i + chunk); return
+            box.mark_set("insert", "1.0")
+            box.config(state="disabled", wrap="word")
+        step(0)
 
     def _browse_inp(self):
         p = filedialog.askopenfilename(
@@ -340,14 +499,45 @@ class App(tk.Tk):
             messagebox.showerror("Not found", f"File not found:\n{inp}"); return
         if not out:
             messagebox.showwarning("No output", "Please choose a save location."); return
+        self._fix_btn.config(state="disabled")
+        self._progress.pack(side="left", padx=14); self._progress.start(12)
+        self._status.set(f"Fixing {os.path.basename(inp)}…")
+        self._worker = threading.Thread(target=self._run_fix, args=(inp, out), daemon=True)
+        self._worker.start()
+
+    def _on_close(self):
+        # Killing the worker mid-write would strand its temp file in the
+        # user's output folder, so let a running fix finish first.
+        if self._worker and self._worker.is_alive():
+            self._closing = True
+            self._status.set("Finishing the current file, then closing…"); return
+        self.destroy()
+
+    def _run_fix(self, inp, out):
+        # Worker thread: no Tk calls here except after(), which hands the
+        # result back to the event loop.
         try:
             stats = fix_file(inp, out)
         except Exception as exc:
-            messagebox.showerror("Error", f"Failed:\n\n{exc}"); return
-
+            self.after(0, lambda e=exc: self._fix_failed(e)); return
+        self.after(0, lambda: self._apply_stats(stats, out))
+
+    def _fix_done(self):
+        self._progress.stop(); self._progress.pack_forget()
+        self._fix_btn.config(state="normal")
+
+    def _fix_failed(self, exc):
+        if self._closing: self.destroy(); return
+        self._fix_done()
+        self._status.set("✘  Failed — see error.")
+        messagebox.showerror("Error", f"Failed:\n\n{exc}")
+
+    def _apply_stats(self, stats, out):
+        if self._closing: self.destroy(); return
+        self._fix_done()
         self._write(self._before_box, stats["before"])
         self._write(self._after_box,  stats["after"])
-        self._show_diff(stats["before"], stats["after"])
+        self._show_diff(stats["before"], stats["after"], stats["groups"])
 
         if stats["groups"] == 0:
             msg = "✔  No phantom spaces found — file was already clean."
@@ -362,22 +552,33 @@ class App(tk.Tk):
             f"Extra characters removed: {stats['chars']}\n\n"
             "All bold / italic / colour / font formatting is intact.")
 
-    def _show_diff(self, before, after):
+    def _show_diff(self, before, after, groups):
         box = self._diff_box
         box.config(state="normal"); box.delete("1.0", "end")
         box.tag_config("rem",   foreground=RED_HL, background="#2a1010")
         box.tag_config("add",   foreground=GREEN,  background="#0a2a15")
         box.tag_config("same",  foreground=DIM)
         box.tag_config("label", foreground=ACCENT, font=("Courier New", 9, "bold"))
+        clean = "\n  (no differences — file was already clean)"
+        if groups == 0:
+            box.insert("end", clean, "label"); box.config(state="disabled"); return
+
+        # Tk's per-call cost dominates on long documents, so lines are grouped
+        # into same-tag runs and everything goes in with a single insert().
+        runs = []   # [tag, [lines]]
         changed = 0
-        for bl, al in zip(before.splitlines(), after.splitlines()):
-            if bl == al: box.insert("end", f"  {al}\n", "same")
+        for bl, al in zip_longest(_iter_lines(before), _iter_lines(after), fillvalue=""):
+            if bl == al: pairs = (("same", f"  {al}\n"),)
             else:
                 changed += 1
-                box.insert("end", f"- {bl}\n", "rem")
-                box.insert("end", f"+ {al}\n", "add")
-        if changed == 0:
-            box.insert("end", "\n  (no differences — file was already clean)", "label")
+                pairs = (("rem", f"- {bl}\n"), ("add", f"+ {al}\n"))
+            for tag, line in pairs:
+                if runs and runs[-1][0] == tag: runs[-1][1].append(line)
+                else: runs.append([tag, [line]])
+        args = []
+        for tag, lines in runs: args += ["".join(lines), tag]
+        if changed == 0: args += [clean, "label"]
+        if args: box.insert("end", *args)
         box.config(state="disabled")
 
 if __name__ == "__main__":